@@ -8,7 +8,7 @@ SQLite database schema for feature storage using SQLAlchemy.
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import Boolean, Column, Integer, String, Text, create_engine
+from sqlalchemy import Boolean, Column, Index, Integer, String, Text, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.types import JSON
@@ -22,12 +22,21 @@ class Feature(Base):
     __tablename__ = "features"
 
     id = Column(Integer, primary_key=True, index=True)
-    priority = Column(Integer, nullable=False, default=999, index=True)
+    priority = Column(Integer, nullable=False, default=999)
     category = Column(String(100), nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     steps = Column(JSON, nullable=False)  # Stored as JSON array
-    passes = Column(Boolean, default=False, index=True)
+    passes = Column(Boolean, default=False)
+
+    __table_args__ = (
+        # Matches the (priority, id) queue ordering so ordered scans and
+        # range seeks on it are served straight from the index.
+        Index("ix_features_priority_id", "priority", "id"),
+        # Serves the passes-filtered queue lookups (next pending feature,
+        # passing feature list) as an index seek with no sort step.
+        Index("ix_features_passes_priority_id", "passes", "priority", "id"),
+    )
 
     def to_dict(self) -> dict:
         """Convert feature to dictionary for JSON serialization."""
@@ -69,6 +78,10 @@ def create_database(project_dir: Path) -> tuple:
     db_url = get_database_url(project_dir)
     engine = create_engine(db_url, connect_args={"check_same_thread": False})
     Base.metadata.create_all(bind=engine)
+    # create_all() skips existing tables entirely, so indexes added after a
+    # project's database was created must be created explicitly.
+    for index in Feature.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     return engine, SessionLocal
 
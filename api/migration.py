@@ -44,11 +44,9 @@ def migrate_json_to_sqlite(
     # Check if database already has data
     session: Session = session_maker()
     try:
-        existing_count = session.query(Feature).count()
-        if existing_count > 0:
-            print(
-                f"Database already has {existing_count} features, skipping migration"
-            )
+        # Existence probe only - no need to count or hydrate a Feature row
+        if session.query(Feature.id).limit(1).scalar() is not None:
+            print("Database already has features, skipping migration")
             return False
     finally:
         session.close()
@@ -88,9 +86,7 @@ def migrate_json_to_sqlite(
 
         session.commit()
 
-        # Verify import
-        final_count = session.query(Feature).count()
-        print(f"Migrated {final_count} features from JSON to SQLite")
+        print(f"Migrated {imported_count} features from JSON to SQLite")
 
     except Exception as e:
         session.rollback()
@@ -18,13 +18,15 @@ Tools:
 import json
 import os
 import sys
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Annotated
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field
-from sqlalchemy.sql.expression import func
+from sqlalchemy import insert, select, update
+from sqlalchemy.sql.expression import case, func
 
 # Add parent directory to path so we can import from api module
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -69,6 +71,15 @@ class BulkCreateInput(BaseModel):
 _session_maker = None
 _engine = None
 
+# Short-lived cache for feature_get_stats, cleared by tools that change counts
+STATS_CACHE_TTL_SECONDS = 3.0
+_stats_cache = {"ts": 0.0, "val": None}
+
+
+def invalidate_stats_cache() -> None:
+    """Drop the cached stats so the next feature_get_stats call re-queries."""
+    _stats_cache["val"] = None
+
 
 @asynccontextmanager
 async def server_lifespan(server: FastMCP):
@@ -102,7 +113,7 @@ def get_session():
     return _session_maker()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def feature_get_stats() -> str:
     """Get statistics about feature completion progress.
 
@@ -112,22 +123,33 @@ def feature_get_stats() -> str:
     Returns:
         JSON with: passing (int), total (int), percentage (float)
     """
+    cached = _stats_cache["val"]
+    if cached is not None and time.monotonic() - _stats_cache["ts"] < STATS_CACHE_TTL_SECONDS:
+        return json.dumps(cached, indent=2)
+
     session = get_session()
     try:
-        total = session.query(Feature).count()
-        passing = session.query(Feature).filter(Feature.passes == True).count()
+        # Single pass over the table: conditional aggregate for passing
+        total, passing = session.query(
+            func.count(Feature.id),
+            func.count(case((Feature.passes == True, 1))),
+        ).one()
         percentage = round((passing / total) * 100, 1) if total > 0 else 0.0
 
-        return json.dumps({
+        stats = {
             "passing": passing,
             "total": total,
             "percentage": percentage
-        }, indent=2)
+        }
+        _stats_cache["val"] = stats
+        _stats_cache["ts"] = time.monotonic()
+
+        return json.dumps(stats, indent=2)
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def feature_get_next() -> str:
     """Get the highest-priority pending feature to work on.
 
@@ -155,7 +177,7 @@ def feature_get_next() -> str:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def feature_get_for_regression(
     limit: Annotated[int, Field(default=3, ge=1, le=10, description="Maximum number of passing features to return")] = 3
 ) -> str:
@@ -189,7 +211,7 @@ def feature_get_for_regression(
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def feature_mark_passing(
     feature_id: Annotated[int, Field(description="The ID of the feature to mark as passing", ge=1)]
 ) -> str:
@@ -212,15 +234,18 @@ def feature_mark_passing(
             return json.dumps({"error": f"Feature with ID {feature_id} not found"})
 
         feature.passes = True
+        # Serialize before commit: commit expires the instance, and reading
+        # it afterwards would re-SELECT values we already hold
+        result = feature.to_dict()
         session.commit()
-        session.refresh(feature)
+        invalidate_stats_cache()
 
-        return json.dumps(feature.to_dict(), indent=2)
+        return json.dumps(result, indent=2)
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def feature_skip(
     feature_id: Annotated[int, Field(description="The ID of the feature to skip", ge=1)]
 ) -> str:
@@ -242,7 +267,12 @@ def feature_skip(
     """
     session = get_session()
     try:
-        feature = session.query(Feature).filter(Feature.id == feature_id).first()
+        # Only the columns needed here - skips loading and decoding steps JSON
+        feature = (
+            session.query(Feature.name, Feature.priority, Feature.passes)
+            .filter(Feature.id == feature_id)
+            .first()
+        )
 
         if feature is None:
             return json.dumps({"error": f"Feature with ID {feature_id} not found"})
@@ -251,27 +281,34 @@ def feature_skip(
             return json.dumps({"error": "Cannot skip a feature that is already passing"})
 
         old_priority = feature.priority
-
-        # Get max priority and set this feature to max + 1
-        max_priority_result = session.query(Feature.priority).order_by(Feature.priority.desc()).first()
-        new_priority = (max_priority_result[0] + 1) if max_priority_result else 1
-
-        feature.priority = new_priority
+        name = feature.name
+
+        # Set this feature to max + 1, computed and assigned in one statement
+        next_priority = select(func.coalesce(func.max(Feature.priority), 0) + 1).scalar_subquery()
+        session.execute(
+            update(Feature)
+            .where(Feature.id == feature_id)
+            .values(priority=next_priority),
+            execution_options={"synchronize_session": False},
+        )
+        # Read back in the same transaction (no RETURNING: needs SQLite 3.35+)
+        new_priority = session.execute(
+            select(Feature.priority).where(Feature.id == feature_id)
+        ).scalar_one()
         session.commit()
-        session.refresh(feature)
 
         return json.dumps({
-            "id": feature.id,
-            "name": feature.name,
+            "id": feature_id,
+            "name": name,
             "old_priority": old_priority,
             "new_priority": new_priority,
-            "message": f"Feature '{feature.name}' moved to end of queue"
+            "message": f"Feature '{name}' moved to end of queue"
         }, indent=2)
     finally:
         session.close()
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 def feature_create_bulk(
     features: Annotated[list[dict], Field(description="List of features to create, each with category, name, description, and steps")]
 ) -> str:
@@ -296,10 +333,10 @@ def feature_create_bulk(
     session = get_session()
     try:
         # Get the starting priority
-        max_priority_result = session.query(Feature.priority).order_by(Feature.priority.desc()).first()
-        start_priority = (max_priority_result[0] + 1) if max_priority_result else 1
+        max_priority = session.query(func.max(Feature.priority)).scalar() or 0
+        start_priority = max_priority + 1
 
-        created_count = 0
+        rows = []
         for i, feature_data in enumerate(features):
             # Validate required fields
             if not all(key in feature_data for key in ["category", "name", "description", "steps"]):
@@ -307,18 +344,25 @@ def feature_create_bulk(
                     "error": f"Feature at index {i} missing required fields (category, name, description, steps)"
                 })
 
-            db_feature = Feature(
-                priority=start_priority + i,
-                category=feature_data["category"],
-                name=feature_data["name"],
-                description=feature_data["description"],
-                steps=feature_data["steps"],
-                passes=False,
-            )
-            session.add(db_feature)
-            created_count += 1
+            rows.append({
+                "priority": start_priority + i,
+                "category": feature_data["category"],
+                "name": feature_data["name"],
+                "description": feature_data["description"],
+                "steps": feature_data["steps"],
+                "passes": False,
+            })
+
+        if not rows:
+            # insert() with an empty parameter list would emit a default-only row
+            return json.dumps({"created": 0}, indent=2)
+
+        # One executemany INSERT instead of per-object unit-of-work flushes
+        session.execute(insert(Feature), rows)
+        created_count = len(rows)
 
         session.commit()
+        invalidate_stats_cache()
 
         return json.dumps({"created": created_count}, indent=2)
     except Exception as e:
@@ -9,6 +9,7 @@ Uses direct SQLite access for database queries.
 import json
 import os
 import sqlite3
+import threading
 import urllib.request
 from datetime import datetime
 from pathlib import Path
@@ -16,6 +17,32 @@ from pathlib import Path
 
 WEBHOOK_URL = os.environ.get("PROGRESS_N8N_WEBHOOK_URL")
 PROGRESS_CACHE_FILE = ".progress_cache"
+# Compact separators: these payloads are machine-read, never shown to users
+JSON_SEPARATORS = (",", ":")
+# IDs bound per IN (...) query; older SQLite builds cap a statement at 999
+SQL_PARAM_BATCH_SIZE = 500
+
+# SQLite connections shared by the reads of one progress check, keyed by
+# database path. Closed again by _close_connections() so no handle on the
+# project database outlives the check.
+_connections: dict[Path, sqlite3.Connection] = {}
+
+
+def _get_connection(db_file: Path) -> sqlite3.Connection:
+    """Return the open connection to db_file, opening it on first use."""
+    conn = _connections.get(db_file)
+    if conn is None:
+        conn = sqlite3.connect(db_file)
+        # Progress tracking only ever reads; the MCP server owns all writes
+        conn.execute("PRAGMA query_only = 1")
+        _connections[db_file] = conn
+    return conn
+
+
+def _close_connections() -> None:
+    """Close every connection opened through _get_connection."""
+    while _connections:
+        _connections.popitem()[1].close()
 
 
 def has_features(project_dir: Path) -> bool:
@@ -32,8 +59,6 @@ def has_features(project_dir: Path) -> bool:
 
     Returns False if no features exist (initializer needs to run).
     """
-    import sqlite3
-
     # Check legacy JSON file first
     json_file = project_dir / "feature_list.json"
     if json_file.exists():
@@ -45,15 +70,14 @@ def has_features(project_dir: Path) -> bool:
         return False
 
     try:
-        conn = sqlite3.connect(db_file)
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM features")
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count > 0
+        # Existence check only - stops at the first row instead of counting
+        row = _get_connection(db_file).execute("SELECT 1 FROM features LIMIT 1").fetchone()
+        return row is not None
     except Exception:
         # Database exists but can't be read or has no features table
         return False
+    finally:
+        _close_connections()
 
 
 def count_passing_tests(project_dir: Path) -> tuple[int, int]:
@@ -71,47 +95,77 @@ def count_passing_tests(project_dir: Path) -> tuple[int, int]:
         return 0, 0
 
     try:
-        conn = sqlite3.connect(db_file)
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM features")
-        total = cursor.fetchone()[0]
-        cursor.execute("SELECT COUNT(*) FROM features WHERE passes = 1")
-        passing = cursor.fetchone()[0]
-        conn.close()
+        cursor = _get_connection(db_file).execute(
+            "SELECT COUNT(*), COUNT(CASE WHEN passes = 1 THEN 1 END) FROM features"
+        )
+        total, passing = cursor.fetchone()
         return passing, total
     except Exception as e:
         print(f"[Database error in count_passing_tests: {e}]")
         return 0, 0
 
 
-def get_all_passing_features(project_dir: Path) -> list[dict]:
-    """
-    Get all passing features for webhook notifications.
+def _query_passing_ids(db_file: Path) -> list[int]:
+    """Return the IDs of all passing features in queue order."""
+    cursor = _get_connection(db_file).execute(
+        "SELECT id FROM features WHERE passes = 1 ORDER BY priority ASC, id ASC"
+    )
+    return [row[0] for row in cursor]
 
-    Args:
-        project_dir: Directory containing the project
 
-    Returns:
-        List of dicts with id, category, name for each passing feature
+def _query_features_by_id(db_file: Path, feature_ids: list[int]) -> list[tuple]:
     """
-    db_file = project_dir / "features.db"
-    if not db_file.exists():
-        return []
+    Return (id, category, name) for the given feature IDs in queue order.
 
+    IDs are bound in batches of plain ? placeholders, which every SQLite
+    build supports, kept under the 999-parameter limit of older builds.
+    """
+    conn = _get_connection(db_file)
+    rows = []
+    for start in range(0, len(feature_ids), SQL_PARAM_BATCH_SIZE):
+        batch = feature_ids[start:start + SQL_PARAM_BATCH_SIZE]
+        placeholders = ", ".join("?" * len(batch))
+        rows.extend(conn.execute(
+            f"SELECT priority, id, category, name FROM features WHERE id IN ({placeholders})",
+            batch,
+        ))
+    rows.sort()
+    return [row[1:] for row in rows]
+
+
+def _post_webhook(payload: dict) -> None:
+    """POST a progress payload to the configured webhook."""
     try:
-        conn = sqlite3.connect(db_file)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, category, name FROM features WHERE passes = 1 ORDER BY priority ASC"
+        req = urllib.request.Request(
+            WEBHOOK_URL,
+            # n8n expects array
+            data=json.dumps([payload], separators=JSON_SEPARATORS).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
         )
-        features = [
-            {"id": row[0], "category": row[1], "name": row[2]}
-            for row in cursor.fetchall()
-        ]
-        conn.close()
-        return features
-    except Exception:
-        return []
+        urllib.request.urlopen(req, timeout=5)
+    except Exception as e:
+        print(f"[Webhook notification failed: {e}]")
+
+
+def _write_progress_cache(cache_file: Path, passing: int, passing_ids: list) -> None:
+    """
+    Write the progress cache atomically.
+
+    The new contents go to a temp file that is then renamed over the
+    cache, so a crash mid-write never leaves a torn cache behind.
+    """
+    data = json.dumps(
+        {"count": passing, "passing_ids": passing_ids},
+        separators=JSON_SEPARATORS,
+    ).encode("utf-8")
+    tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+    try:
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, cache_file)
+    finally:
+        # Only still present if the write or rename failed; don't leave it
+        # in the project directory for the agent's `git add .` to pick up
+        tmp_file.unlink(missing_ok=True)
 
 
 def send_progress_webhook(passing: int, total: int, project_dir: Path) -> None:
@@ -126,7 +180,7 @@ def send_progress_webhook(passing: int, total: int, project_dir: Path) -> None:
     # Read previous progress and passing feature IDs
     if cache_file.exists():
         try:
-            cache_data = json.loads(cache_file.read_text())
+            cache_data = json.loads(cache_file.read_bytes())
             previous = cache_data.get("count", 0)
             previous_passing_ids = set(cache_data.get("passing_ids", []))
         except Exception:
@@ -136,26 +190,36 @@ def send_progress_webhook(passing: int, total: int, project_dir: Path) -> None:
     if passing > previous:
         # Find which features are now passing via API
         completed_tests = []
-        current_passing_ids = []
 
         # Detect transition from old cache format (had count but no passing_ids)
         # In this case, we can't reliably identify which specific tests are new
         is_old_cache_format = len(previous_passing_ids) == 0 and previous > 0
 
-        # Get all passing features via direct database access
-        all_passing = get_all_passing_features(project_dir)
-        for feature in all_passing:
-            feature_id = feature.get("id")
-            current_passing_ids.append(feature_id)
-            # Only identify individual new tests if we have previous IDs to compare
-            if not is_old_cache_format and feature_id not in previous_passing_ids:
-                # This feature is newly passing
-                name = feature.get("name", f"Feature #{feature_id}")
-                category = feature.get("category", "")
-                if category:
-                    completed_tests.append(f"{category} {name}")
-                else:
-                    completed_tests.append(name)
+        db_file = project_dir / "features.db"
+        if not db_file.exists():
+            return
+
+        try:
+            # Only IDs for the full passing set (an index-only scan); names are
+            # fetched just for the newly passing ones. Rebuilding the ID list
+            # from the database drops cached IDs that no longer pass or exist.
+            current_passing_ids = _query_passing_ids(db_file)
+            if is_old_cache_format:
+                new_features = []
+            else:
+                new_ids = [i for i in current_passing_ids if i not in previous_passing_ids]
+                new_features = _query_features_by_id(db_file, new_ids)
+        except Exception as e:
+            # Leave the cache untouched so these features are reported next time
+            print(f"[Database error in send_progress_webhook: {e}]")
+            return
+
+        for feature_id, category, name in new_features:
+            name = name or f"Feature #{feature_id}"
+            if category:
+                completed_tests.append(f"{category} {name}")
+            else:
+                completed_tests.append(name)
 
         payload = {
             "event": "test_progress",
@@ -169,28 +233,20 @@ def send_progress_webhook(passing: int, total: int, project_dir: Path) -> None:
             "timestamp": datetime.utcnow().isoformat() + "Z",
         }
 
-        try:
-            req = urllib.request.Request(
-                WEBHOOK_URL,
-                data=json.dumps([payload]).encode("utf-8"),  # n8n expects array
-                headers={"Content-Type": "application/json"},
-            )
-            urllib.request.urlopen(req, timeout=5)
-        except Exception as e:
-            print(f"[Webhook notification failed: {e}]")
+        # Post in the background so the agent loop doesn't wait on the
+        # network; a non-daemon thread still finishes before interpreter exit
+        threading.Thread(
+            target=_post_webhook, args=(payload,), name="progress-webhook"
+        ).start()
 
         # Update cache with count and passing IDs
-        cache_file.write_text(
-            json.dumps({"count": passing, "passing_ids": current_passing_ids})
-        )
+        _write_progress_cache(cache_file, passing, current_passing_ids)
     else:
         # Update cache even if no change (for initial state)
         if not cache_file.exists():
-            all_passing = get_all_passing_features(project_dir)
-            current_passing_ids = [f.get("id") for f in all_passing]
-            cache_file.write_text(
-                json.dumps({"count": passing, "passing_ids": current_passing_ids})
-            )
+            # No cache means previous == 0, and passing <= previous got us
+            # here, so nothing is passing yet and there is nothing to look up
+            _write_progress_cache(cache_file, passing, [])
 
 
 def print_session_header(session_num: int, is_initializer: bool) -> None:
@@ -205,11 +261,15 @@ def print_session_header(session_num: int, is_initializer: bool) -> None:
 
 def print_progress_summary(project_dir: Path) -> None:
     """Print a summary of current progress."""
-    passing, total = count_passing_tests(project_dir)
-
-    if total > 0:
-        percentage = (passing / total) * 100
-        print(f"\nProgress: {passing}/{total} tests passing ({percentage:.1f}%)")
-        send_progress_webhook(passing, total, project_dir)
-    else:
-        print("\nProgress: No features in database yet")
+    try:
+        passing, total = count_passing_tests(project_dir)
+
+        if total > 0:
+            percentage = (passing / total) * 100
+            print(f"\nProgress: {passing}/{total} tests passing ({percentage:.1f}%)")
+            send_progress_webhook(passing, total, project_dir)
+        else:
+            print("\nProgress: No features in database yet")
+    finally:
+        # Release the project database between sessions
+        _close_connections()
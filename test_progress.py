@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Progress Webhook Tests
+======================
+
+Tests for the progress cache and newly-passing detection in
+send_progress_webhook.
+Run with: python test_progress.py
+"""
+
+import json
+import sqlite3
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import progress
+
+
+def make_project(passing_ids: list[int], total: int = 5) -> Path:
+    """Create a project dir with a features.db holding `total` features."""
+    project_dir = Path(tempfile.mkdtemp())
+    conn = sqlite3.connect(project_dir / "features.db")
+    conn.execute(
+        "CREATE TABLE features (id INTEGER PRIMARY KEY, priority INTEGER, "
+        "category TEXT, name TEXT, passes BOOLEAN)"
+    )
+    conn.executemany(
+        "INSERT INTO features VALUES (?, ?, ?, ?, ?)",
+        [(i, i, "Cat", f"Feature {i}", i in passing_ids) for i in range(1, total + 1)],
+    )
+    conn.commit()
+    conn.close()
+    return project_dir
+
+
+def write_cache(project_dir: Path, data: dict) -> None:
+    """Write a progress cache file for the project."""
+    (project_dir / progress.PROGRESS_CACHE_FILE).write_text(json.dumps(data))
+
+
+def read_cache(project_dir: Path) -> dict:
+    """Read back the project's progress cache file."""
+    return json.loads((project_dir / progress.PROGRESS_CACHE_FILE).read_text())
+
+
+def run_webhook(project_dir: Path, passing: int, total: int = 5) -> list[dict]:
+    """Run send_progress_webhook and return the payloads it posted."""
+    sent = []
+    original_post = progress._post_webhook
+    original_url = progress.WEBHOOK_URL
+    progress._post_webhook = sent.append
+    progress.WEBHOOK_URL = "http://example.invalid/webhook"
+    try:
+        progress.send_progress_webhook(passing, total, project_dir)
+        for thread in threading.enumerate():
+            if thread.name == "progress-webhook":
+                thread.join()
+    finally:
+        progress._close_connections()
+        progress._post_webhook = original_post
+        progress.WEBHOOK_URL = original_url
+    return sent
+
+
+def check(description: str, actual, expected) -> bool:
+    """Compare a single result, printing PASS/FAIL like the security tests."""
+    if actual == expected:
+        print(f"  PASS: {description}")
+        return True
+    print(f"  FAIL: {description}")
+    print(f"         Expected: {expected!r}, Got: {actual!r}")
+    return False
+
+
+def test_newly_passing_diff():
+    """Only features missing from the cached IDs are reported."""
+    print("\nTesting newly passing diff:\n")
+    project_dir = make_project(passing_ids=[1, 2, 4])
+    write_cache(project_dir, {"count": 1, "passing_ids": [2]})
+
+    sent = run_webhook(project_dir, passing=3)
+
+    results = [
+        check("one webhook sent", len(sent), 1),
+        check(
+            "completed_tests lists only new features",
+            sent[0]["completed_tests"] if sent else None,
+            ["Cat Feature 1", "Cat Feature 4"],
+        ),
+        check("cache updated", read_cache(project_dir), {"count": 3, "passing_ids": [1, 2, 4]}),
+    ]
+    return sum(results), len(results) - sum(results)
+
+
+def test_stale_ids_pruned():
+    """Cached IDs that no longer pass or exist are dropped from the cache."""
+    print("\nTesting stale cached IDs:\n")
+    project_dir = make_project(passing_ids=[1, 3])
+    write_cache(project_dir, {"count": 1, "passing_ids": [2, 99]})
+
+    sent = run_webhook(project_dir, passing=2)
+
+    results = [
+        check(
+            "stale IDs don't suppress reports",
+            sent[0]["completed_tests"] if sent else None,
+            ["Cat Feature 1", "Cat Feature 3"],
+        ),
+        check("stale IDs pruned", read_cache(project_dir), {"count": 2, "passing_ids": [1, 3]}),
+    ]
+    return sum(results), len(results) - sum(results)
+
+
+def test_old_cache_format():
+    """A count-only cache records IDs without naming individual tests."""
+    print("\nTesting old cache format:\n")
+    project_dir = make_project(passing_ids=[1, 2, 3])
+    write_cache(project_dir, {"count": 2})
+
+    sent = run_webhook(project_dir, passing=3)
+
+    results = [
+        check(
+            "no individual tests named",
+            sent[0]["completed_tests"] if sent else None,
+            [],
+        ),
+        check("cache upgraded", read_cache(project_dir), {"count": 3, "passing_ids": [1, 2, 3]}),
+    ]
+    return sum(results), len(results) - sum(results)
+
+
+def test_db_error_keeps_cache():
+    """A database error sends nothing and leaves the cache untouched."""
+    print("\nTesting database error:\n")
+    project_dir = make_project(passing_ids=[1, 2])
+    cache = {"count": 1, "passing_ids": [1]}
+    write_cache(project_dir, cache)
+
+    conn = sqlite3.connect(project_dir / "features.db")
+    conn.execute("ALTER TABLE features RENAME TO features_old")
+    conn.commit()
+    conn.close()
+
+    sent = run_webhook(project_dir, passing=2)
+
+    results = [
+        check("no webhook sent", sent, []),
+        check("cache untouched", read_cache(project_dir), cache),
+        check(
+            "no temp file left",
+            (project_dir / (progress.PROGRESS_CACHE_FILE + ".tmp")).exists(),
+            False,
+        ),
+    ]
+    return sum(results), len(results) - sum(results)
+
+
+def main():
+    print("=" * 70)
+    print("  PROGRESS WEBHOOK TESTS")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    for test in (
+        test_newly_passing_diff,
+        test_stale_ids_pruned,
+        test_old_cache_format,
+        test_db_error_keeps_cache,
+    ):
+        test_passed, test_failed = test()
+        passed += test_passed
+        failed += test_failed
+
+    # Summary
+    print("\n" + "-" * 70)
+    print(f"  Results: {passed} passed, {failed} failed")
+    print("-" * 70)
+
+    if failed == 0:
+        print("\n  ALL TESTS PASSED")
+        return 0
+    else:
+        print(f"\n  {failed} TEST(S) FAILED")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())